@@ -1,9 +1,11 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-from datetime import datetime, timedelta
+import pyarrow as pa
 import sqlite3
-from typing import List, Tuple
+import threading
+import time
+from datetime import datetime
+from typing import Tuple
 
 # Page Configuration
 st.set_page_config(
@@ -13,8 +15,10 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS
-st.markdown("""
+# ==================== Static HTML ====================
+
+# Sent with st.html, which skips markdown processing for raw HTML
+PAGE_CSS = """
     <style>
     .stTabs [data-baseweb="tab-list"] button [data-testid="stMarkdownContainer"] p {
         font-size: 1.1rem;
@@ -38,10 +42,409 @@ st.markdown("""
         padding: 10px;
     }
     </style>
-    """, unsafe_allow_html=True)
+    """
+
+HOME_BANNER_HTML = """
+    <div style='text-align: center; margin: 30px 0;'>
+        <h1 style='color: #1f77b4; font-size: 2.5rem; font-weight: bold;'>
+            🎯 Core Window Function Categories
+        </h1>
+        <p style='color: #666; font-size: 1.1rem;'>Master all 15+ window functions</p>
+    </div>
+    """
+
+# Custom CSS
+st.html(PAGE_CSS)
+
+# ==================== Demo Queries ====================
+
+# Kept flush-left so st.code displays them without leading indentation
+QUERIES = {
+    "sum_running_total": """SELECT
+    employee_id,
+    employee_name,
+    department,
+    salary,
+    SUM(salary) OVER (
+        PARTITION BY department
+        ORDER BY employee_id
+        ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+    ) AS running_total
+FROM employees
+ORDER BY department, employee_id;""",
+    "sum_dept_total": """SELECT
+    employee_id,
+    employee_name,
+    department,
+    salary,
+    SUM(salary) OVER (PARTITION BY department) AS dept_total
+FROM employees
+ORDER BY department, salary DESC;""",
+    "avg_dept_compare": """SELECT
+    employee_name,
+    department,
+    salary,
+    ROUND(AVG(salary) OVER (PARTITION BY department), 2) AS dept_avg,
+    ROUND(salary - AVG(salary) OVER (PARTITION BY department), 2) AS diff_from_avg
+FROM employees
+ORDER BY department, salary DESC;""",
+    "count_customer_orders": """SELECT
+    order_id,
+    customer_id,
+    customer_name,
+    order_amount,
+    COUNT(*) OVER (PARTITION BY customer_id) AS customer_order_count,
+    ROUND(AVG(order_amount) OVER (PARTITION BY customer_id), 2) AS avg_order_amount
+FROM orders
+ORDER BY customer_id, order_date;""",
+    "minmax_salary_range": """SELECT
+    employee_name,
+    department,
+    salary,
+    MAX(salary) OVER (PARTITION BY department) AS max_salary,
+    MIN(salary) OVER (PARTITION BY department) AS min_salary,
+    MAX(salary) OVER (PARTITION BY department) - salary AS gap_to_max
+FROM employees
+ORDER BY department, salary DESC;""",
+    "combined_dept_summary": """SELECT
+    department,
+    employee_name,
+    salary,
+    COUNT(*) OVER (PARTITION BY department) AS emp_count,
+    SUM(salary) OVER (PARTITION BY department) AS total_salary,
+    ROUND(AVG(salary) OVER (PARTITION BY department), 2) AS avg_salary,
+    MAX(salary) OVER (PARTITION BY department) AS max_salary,
+    MIN(salary) OVER (PARTITION BY department) AS min_salary
+FROM employees
+ORDER BY department, salary DESC;""",
+    "row_number_top_performers": """SELECT
+    ROW_NUMBER() OVER (PARTITION BY department ORDER BY salary DESC) AS rank,
+    employee_name,
+    department,
+    salary
+FROM employees
+ORDER BY department, rank;""",
+    "rank_region_sales": """SELECT
+    RANK() OVER (PARTITION BY region ORDER BY amount DESC) AS rank,
+    product,
+    region,
+    amount
+FROM sales
+ORDER BY region, rank;""",
+    "dense_rank_product": """SELECT
+    DENSE_RANK() OVER (PARTITION BY product ORDER BY amount DESC) AS rank,
+    product,
+    region,
+    amount
+FROM sales
+ORDER BY product, rank;""",
+    "ntile_order_quartiles": """SELECT
+    NTILE(4) OVER (ORDER BY order_amount DESC) AS quartile,
+    customer_name,
+    order_amount
+FROM orders
+ORDER BY quartile, order_amount DESC;""",
+    "percent_rank_salary": """SELECT
+    employee_name,
+    department,
+    salary,
+    ROUND(PERCENT_RANK() OVER (PARTITION BY department ORDER BY salary), 4) AS pct_rank,
+    ROUND(PERCENT_RANK() OVER (PARTITION BY department ORDER BY salary) * 100, 2) AS pct
+FROM employees
+ORDER BY department, salary;""",
+    "lag_order_change": """SELECT
+    order_id,
+    customer_name,
+    order_amount,
+    LAG(order_amount) OVER (PARTITION BY customer_id ORDER BY order_id) AS prev_order,
+    order_amount - LAG(order_amount) OVER (PARTITION BY customer_id ORDER BY order_id) AS change
+FROM orders
+ORDER BY customer_id, order_id;""",
+    "lead_next_sale": """SELECT
+    sale_id,
+    product,
+    amount,
+    LEAD(amount) OVER (PARTITION BY product ORDER BY sale_id) AS next_amount,
+    LEAD(sale_date) OVER (PARTITION BY product ORDER BY sale_id) AS next_date
+FROM sales
+ORDER BY product, sale_id;""",
+    "first_value_order": """SELECT
+    order_id,
+    customer_name,
+    order_amount,
+    FIRST_VALUE(order_amount) OVER (
+        PARTITION BY customer_id
+        ORDER BY order_id
+    ) AS first_order,
+    order_amount - FIRST_VALUE(order_amount) OVER (
+        PARTITION BY customer_id
+        ORDER BY order_id
+    ) AS growth
+FROM orders
+ORDER BY customer_id, order_id;""",
+    "last_value_order": """SELECT
+    order_id,
+    customer_name,
+    order_amount,
+    LAST_VALUE(order_amount) OVER (
+        PARTITION BY customer_id
+        ORDER BY order_id
+        ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
+    ) AS latest_order,
+    LAST_VALUE(order_id) OVER (
+        PARTITION BY customer_id
+        ORDER BY order_id
+        ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
+    ) AS latest_order_id
+FROM orders
+ORDER BY customer_id, order_id;""",
+    "nth_value_second_salary": """WITH ranked_employees AS (
+    SELECT
+        department,
+        employee_name,
+        salary,
+        NTH_VALUE(salary, 2) OVER (
+            PARTITION BY department
+            ORDER BY salary DESC
+            ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
+        ) AS second_highest_salary,
+        NTH_VALUE(employee_name, 2) OVER (
+            PARTITION BY department
+            ORDER BY salary DESC
+            ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
+        ) AS second_highest_emp
+    FROM employees
+)
+SELECT DISTINCT
+    department,
+    second_highest_salary,
+    second_highest_emp
+FROM ranked_employees
+WHERE second_highest_salary IS NOT NULL;""",
+}
+
+# ==================== Reference Content ====================
+
+# Custom Query page: schema of the sample tables
+AVAILABLE_TABLES_MD = """
+**employees**
+- employee_id (INTEGER)
+- employee_name (TEXT)
+- department (TEXT)
+- salary (INTEGER)
+- hire_date (TEXT)
+
+**sales**
+- sale_id (INTEGER)
+- sale_date (DATETIME)
+- product (TEXT)
+- amount (INTEGER)
+- region (TEXT)
+
+**orders**
+- order_id (INTEGER)
+- customer_id (INTEGER)
+- customer_name (TEXT)
+- order_date (DATETIME)
+- order_amount (INTEGER)
+
+**performance**
+- employee_id (INTEGER)
+- month (TEXT)
+- revenue (INTEGER)
+- target (INTEGER)
+"""
+
+# Custom Query page: starter queries
+QUERY_EXAMPLES_MD = """
+```sql
+-- Running Total of Sales Amount
+SELECT
+    sale_id,
+    product,
+    amount,
+    SUM(amount) OVER (ORDER BY sale_id)
+FROM sales;
+```
+
+```sql
+-- Top 3 Sales by Region
+SELECT * FROM (
+    SELECT
+    *,
+    ROW_NUMBER() OVER (PARTITION BY region
+                ORDER BY amount DESC)
+    FROM sales
+) WHERE ROW_NUMBER <= 3;
+```
+```sql
+-- Moving Average of Sales Amount
+SELECT
+    sale_id,
+    sale_date,
+    amount,
+    AVG(amount) OVER (
+    ORDER BY sale_id
+    ROWS BETWEEN 2 PRECEDING AND CURRENT ROW
+    ) as moving_avg
+FROM sales;
+```
+"""
+
+# Quick Reference page: performance tips
+PERF_TIPS_MD = """
+1. **Index Partition Columns**: Create index on columns used in PARTITION BY
+   ```sql
+   CREATE INDEX idx_dept_id ON employees(department, employee_id);
+   ```
+
+2. **Check Execution Plan**: Understand query performance
+   ```sql
+   EXPLAIN SELECT ... FROM employees WHERE ...;
+   ```
+
+3. **Materialize Complex Results**: Store intermediate results
+   ```sql
+   CREATE TEMP TABLE ranked_data AS
+   SELECT *, ROW_NUMBER() OVER (...) FROM ...;
+   ```
+
+4. **Use Specific Frames**: Narrow frames perform better
+   ```sql
+   -- Better: Specific frame
+   ROWS BETWEEN 10 PRECEDING AND CURRENT ROW
+   -- Instead of: Full frame
+   ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
+   ```
+
+5. **Reuse Window Definitions**: Use WINDOW clause (some SQL dialects)
+   ```sql
+   SELECT *,
+       ROW_NUMBER() OVER w as rn,
+       RANK() OVER w as rank
+   FROM employees
+   WINDOW w AS (PARTITION BY department ORDER BY salary DESC);
+   ```
+"""
+
+# SQL snippets shown on the Quick Reference page
+SNIPPETS = {
+    "basic_syntax": """SELECT
+    column1,
+    column2,
+    WINDOW_FUNCTION() OVER (
+        [PARTITION BY column]
+        [ORDER BY column [ASC|DESC]]
+        [ROWS BETWEEN ... AND ...]
+    ) AS window_result
+FROM table_name;""",
+    "frame_bounds": """ROWS BETWEEN
+    UNBOUNDED PRECEDING      -- From first row
+    | n PRECEDING            -- n rows before
+    | CURRENT ROW
+    AND
+    CURRENT ROW
+    | n FOLLOWING            -- n rows after
+    | UNBOUNDED FOLLOWING    -- To last row""",
+    "rows_frame": """ROWS BETWEEN 5 PRECEDING
+AND CURRENT ROW""",
+    "range_frame": """RANGE BETWEEN INTERVAL '7 days' PRECEDING
+AND CURRENT ROW""",
+    "running_total": """SELECT
+    date,
+    amount,
+    SUM(amount) OVER (
+        ORDER BY date
+        ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+    ) as running_total
+FROM transactions;""",
+    "top_n_per_group": """SELECT * FROM (
+    SELECT
+        *,
+        ROW_NUMBER() OVER (
+            PARTITION BY department
+            ORDER BY salary DESC
+        ) as rank
+    FROM employees
+) ranked
+WHERE rank <= 3;""",
+    "group_average": """SELECT
+    name,
+    value,
+    AVG(value) OVER (PARTITION BY group) as avg,
+    value - AVG(value) OVER (PARTITION BY group) as diff
+FROM data;""",
+    "month_over_month": """SELECT
+    month,
+    revenue,
+    LAG(revenue) OVER (ORDER BY month) as prev_revenue,
+    revenue - LAG(revenue) OVER (ORDER BY month) as change,
+    ROUND(100.0 * (revenue - LAG(revenue) OVER (ORDER BY month))
+        / LAG(revenue) OVER (ORDER BY month), 2) as pct_change
+FROM monthly_data;""",
+    "missing_order_by_wrong": """SELECT
+    SUM(salary) OVER (
+        PARTITION BY department
+    )
+FROM employees;
+-- Returns department total, not running total!""",
+    "missing_order_by_correct": """SELECT
+    SUM(salary) OVER (
+        PARTITION BY department
+        ORDER BY employee_id
+        ROWS BETWEEN UNBOUNDED PRECEDING
+            AND CURRENT ROW
+    )
+FROM employees;
+-- Returns running total""",
+    "last_value_frame_wrong": """SELECT
+    LAST_VALUE(salary) OVER (
+        PARTITION BY department
+        ORDER BY employee_id
+    )
+-- Returns current or next row only!""",
+    "last_value_frame_correct": """SELECT
+    LAST_VALUE(salary) OVER (
+        PARTITION BY department
+        ORDER BY employee_id
+        ROWS BETWEEN UNBOUNDED PRECEDING
+            AND UNBOUNDED FOLLOWING
+    )
+-- Returns actual last value""",
+    "window_in_group_by_wrong": """SELECT
+    department,
+    ROW_NUMBER() OVER (...) as num
+FROM employees
+GROUP BY department
+-- Error! Can't use window in GROUP BY""",
+    "window_in_group_by_correct": """WITH ranked AS (
+    SELECT
+        department,
+        salary,
+        ROW_NUMBER() OVER (...) as num
+    FROM employees
+)
+SELECT * FROM ranked
+-- Use CTE first""",
+}
+
+# (use case, function) rows for the Quick Reference lookup table
+REFERENCE_ROWS = (
+    ("Get running total", "SUM + ORDER BY + ROWS"),
+    ("Top N per group", "ROW_NUMBER + PARTITION BY"),
+    ("Compare individuals to group", "AVG + PARTITION BY"),
+    ("Date-over-date change", "LAG or LEAD"),
+    ("Rank with gaps on ties", "RANK()"),
+    ("Rank without gaps", "DENSE_RANK()"),
+    ("Divide into quartiles", "NTILE(4)"),
+    ("Get previous row value", "LAG()"),
+    ("Access first value", "FIRST_VALUE()"),
+    ("Complex relative position", "NTH_VALUE()"),
+)
 
 # ==================== Sample Data Generation ====================
 
+@st.cache_data(show_spinner=False)
 def create_sample_data():
     """Create sample data for demonstrations"""
     # Employees data
@@ -53,10 +456,13 @@ def create_sample_data():
         'hire_date': ['2020-01-15', '2019-03-20', '2021-06-10', '2018-02-01', '2017-08-15', '2019-11-30', '2020-05-10', '2021-02-20', '2019-04-15', '2022-01-10']
     }
     
+    # Sales and orders both fall on every other day from Jan 1, 2024
+    every_other_day = pd.date_range('2024-01-01', periods=20, freq='2D')
+    
     # Sales data
     sales_data = {
         'sale_id': list(range(1, 21)),
-        'sale_date': [datetime(2024, 1, 1) + timedelta(days=i*2) for i in range(20)],
+        'sale_date': every_other_day,
         'product': ['A', 'B', 'A', 'C', 'B', 'A', 'C', 'B', 'A', 'C', 'B', 'A', 'C', 'B', 'A', 'C', 'B', 'A', 'C', 'B'],
         'amount': [100, 150, 120, 200, 180, 140, 220, 160, 130, 210, 190, 150, 230, 170, 140, 250, 200, 160, 240, 210],
         'region': ['North', 'South', 'North', 'South', 'East', 'West', 'East', 'West', 'North', 'South', 'North', 'South', 'East', 'West', 'East', 'West', 'North', 'South', 'North', 'South']
@@ -67,7 +473,7 @@ def create_sample_data():
         'order_id': list(range(1, 21)),
         'customer_id': [1, 1, 1, 2, 2, 2, 3, 3, 4, 4, 5, 5, 5, 6, 6, 7, 7, 8, 8, 9],
         'customer_name': ['John', 'John', 'John', 'Jane', 'Jane', 'Jane', 'Mike', 'Mike', 'Sarah', 'Sarah', 'Tom', 'Tom', 'Tom', 'Alice', 'Alice', 'Bob', 'Bob', 'Carol', 'Carol', 'David'],
-        'order_date': [datetime(2024, 1, i*2+1) if i*2+1 <= 31 else datetime(2024, 2, (i*2+1)%31) for i in range(20)],
+        'order_date': every_other_day,
         'order_amount': [100, 250, 150, 200, 300, 250, 120, 180, 90, 140, 250, 200, 180, 160, 220, 140, 190, 230, 200, 150]
     }
     
@@ -80,826 +486,733 @@ def create_sample_data():
         'target': [5000, 6000, 5000, 8000, 8500, 5000, 6000, 5000, 8000, 8500]
     }
     
-    return (
+    frames = (
         pd.DataFrame(employees_data),
         pd.DataFrame(sales_data),
         pd.DataFrame(orders_data),
         pd.DataFrame(performance_data)
     )
+    
+    # Arrow-backed strings convert to Arrow tables without per-cell copies
+    for df in frames:
+        text_columns = df.select_dtypes(['object', 'string']).columns
+        df[text_columns] = df[text_columns].astype('string[pyarrow]')
+    
+    return frames
+
+
+@st.cache_resource
+def sample_tables():
+    """Sample data as Arrow tables, converted once for display"""
+    return tuple(
+        pa.Table.from_pandas(df, preserve_index=False)
+        for df in create_sample_data()
+    )
+
 
+QUERY_TIME_LIMIT = 5  # seconds before a custom query is interrupted
+FETCH_BATCH_ROWS = 8192  # rows pulled from the cursor per Arrow record batch
+PREVIEW_ROWS = 100  # custom query rows shown in the grid before offering a download
 
-def execute_query(query: str, connection) -> Tuple[pd.DataFrame, str]:
+
+def arrow_column(values: list) -> pa.Array:
+    """Build an Arrow array from one column of SQLite values"""
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # SQLite columns can mix storage classes; fall back to text
+        return pa.array([None if v is None else str(v) for v in values], pa.string())
+
+
+def batch_column_type(types: set) -> pa.DataType:
+    """Pick the type one result column takes across all fetched batches"""
+    types = types - {pa.null()}
+    if len(types) <= 1:
+        return types.pop() if types else pa.null()
+    if all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in types):
+        return pa.float64()
+    return pa.string()
+
+
+def unify_batches(batches: list) -> list:
+    """Give every batch the same column types, matching columns by position"""
+    # Unifying by position rather than name keeps duplicate column names working
+    targets = [
+        batch_column_type({batch.column(i).type for batch in batches})
+        for i in range(batches[0].num_columns)
+    ]
+    unified = []
+    for batch in batches:
+        columns = []
+        for column, target in zip(batch.columns, targets):
+            if column.type == target:
+                columns.append(column)
+            elif target == pa.string():
+                # Same str() formatting as arrow_column, so one column has one format
+                values = column.to_pylist()
+                columns.append(pa.array([None if v is None else str(v) for v in values], pa.string()))
+            else:
+                columns.append(column.cast(target, safe=False))
+        unified.append(pa.table(columns, names=batch.column_names))
+    return unified
+
+
+def fetch_arrow(connection, query: str) -> pa.Table:
+    """Run a query and read its rows straight into an Arrow table"""
+    cursor = connection.execute(query)
+    names = [column[0] for column in cursor.description or ()]
+    batches = []
+    while rows := cursor.fetchmany(FETCH_BATCH_ROWS):
+        arrays = [arrow_column(list(values)) for values in zip(*rows)]
+        batches.append(pa.table(arrays, names=names))
+    if not batches:
+        return pa.table([pa.array([], pa.null()) for _ in names], names=names)
+    if len(batches) == 1:
+        return batches[0]
+    # Batches infer types separately (e.g. an all-NULL batch), so align them first
+    return pa.concat_tables(unify_batches(batches))
+
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def run_query(query: str) -> pa.Table:
+    """Run SQL under the time limit, memoizing successful results on the SQL text"""
+    conn = init_database()
+    # The progress handler belongs to the shared connection, so one query at a time
+    with connection_lock():
+        deadline = time.monotonic() + QUERY_TIME_LIMIT
+        # Checked every 10k VM steps; a truthy return aborts the statement
+        conn.set_progress_handler(lambda: time.monotonic() > deadline, 10000)
+        try:
+            return fetch_arrow(conn, query)
+        except Exception as e:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Query took longer than {QUERY_TIME_LIMIT} seconds and was stopped") from e
+            raise
+        finally:
+            conn.set_progress_handler(None, 0)
+
+
+def execute_query(query: str) -> Tuple[pa.Table, str]:
     """Execute SQL query and return results"""
+    # Errors are raised past st.cache_data, so a timeout on a busy server is not cached
     try:
-        result = pd.read_sql_query(query, connection)
-        return result, None
+        return run_query(query), None
     except Exception as e:
         return None, str(e)
 
 
 # ==================== Initialize Database ====================
 
+def sqlite_type(dtype) -> str:
+    """Map a pandas dtype to the SQLite column type"""
+    if pd.api.types.is_integer_dtype(dtype):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'REAL'
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'TIMESTAMP'
+    return 'TEXT'
+
+
+def load_table(connection, name: str, df: pd.DataFrame):
+    """Create a table for a DataFrame and bulk insert its rows"""
+    columns = ', '.join(f'"{col}" {sqlite_type(dtype)}' for col, dtype in df.dtypes.items())
+    placeholders = ', '.join('?' * len(df.columns))
+    
+    # sqlite3 cannot bind pandas Timestamps, so store them as text
+    df = df.assign(**{
+        col: df[col].dt.strftime('%Y-%m-%d %H:%M:%S')
+        for col in df.select_dtypes('datetime').columns
+    })
+    
+    connection.execute(f'CREATE TABLE "{name}" ({columns})')
+    connection.executemany(
+        f'INSERT INTO "{name}" VALUES ({placeholders})',
+        df.itertuples(index=False, name=None)
+    )
+
+
+def parse_timestamp(value: bytes):
+    """SQLite converter for TIMESTAMP columns; non-ISO values stay as text"""
+    text = value.decode()
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        # A compound SELECT takes its declared type from the first arm only
+        return text
+
+
+def keep_read_only(action, arg1, arg2, db_name, trigger):
+    """SQLite authorizer that keeps custom queries away from files and query_only"""
+    # VACUUM INTO is checked as an ATTACH, so this also stops it creating files
+    if action in (sqlite3.SQLITE_ATTACH, sqlite3.SQLITE_DETACH):
+        return sqlite3.SQLITE_DENY
+    if action == sqlite3.SQLITE_PRAGMA and arg1.lower() == 'query_only' and arg2 is not None:
+        return sqlite3.SQLITE_DENY
+    return sqlite3.SQLITE_OK
+
+
 @st.cache_resource
 def init_database():
     """Initialize SQLite database with sample data"""
-    conn = sqlite3.connect(':memory:', check_same_thread=False)
+    # Read TIMESTAMP columns back as datetimes rather than text
+    sqlite3.register_converter('TIMESTAMP', parse_timestamp)
+    conn = sqlite3.connect(':memory:', detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+    # Window sorts over large custom results spill to temp storage; keep it in RAM
+    conn.execute('PRAGMA temp_store = MEMORY')
     
     employees_df, sales_df, orders_df, performance_df = create_sample_data()
     
-    employees_df.to_sql('employees', conn, if_exists='replace', index=False)
-    sales_df.to_sql('sales', conn, if_exists='replace', index=False)
-    orders_df.to_sql('orders', conn, if_exists='replace', index=False)
-    performance_df.to_sql('performance', conn, if_exists='replace', index=False)
+    with conn:
+        load_table(conn, 'employees', employees_df)
+        load_table(conn, 'sales', sales_df)
+        load_table(conn, 'orders', orders_df)
+        load_table(conn, 'performance', performance_df)
+    
+    # Index the PARTITION BY / ORDER BY columns the demo windows use
+    conn.executescript("""
+        CREATE INDEX idx_employees_dept_id ON employees(department, employee_id);
+        CREATE INDEX idx_sales_region_amount ON sales(region, amount);
+        CREATE INDEX idx_sales_product_id ON sales(product, sale_id);
+        CREATE INDEX idx_orders_customer_id ON orders(customer_id, order_id);
+        ANALYZE;
+    """)
+    
+    # Custom queries share this connection, so reject anything that writes
+    conn.execute('PRAGMA query_only = ON')
+    conn.set_authorizer(keep_read_only)
     
     return conn
 
 
-# ==================== Main App ====================
+@st.cache_resource
+def connection_lock():
+    """Lock serializing statements on the shared connection across sessions"""
+    return threading.Lock()
 
-st.title("📊 SQL Window Functions Interactive Cheat Sheet")
-st.markdown("Master SQL Window Functions with Real-Time Examples...")
 
-conn = init_database()
+@st.cache_resource
+def precomputed_results():
+    """Run every demo query once and keep the results as Arrow tables"""
+    conn = init_database()
+    # Stored as Arrow so reruns skip the pandas-to-Arrow conversion in st.dataframe
+    with connection_lock():
+        return {key: fetch_arrow(conn, query) for key, query in QUERIES.items()}
 
-# Sidebar Navigation
-with st.sidebar:
-    st.header("📊 SQL Window Functions")
-    page = st.radio(
-        "Select a Section:",
-        [
-            "Home",
-            "Aggregate Functions",
-            "Ranking Functions",
-            "Analytical Functions",
-            "Sample Data",
-            "Custom Query",
-            "Quick Reference"
-        ],
-        label_visibility="collapsed"
-    )
+
+@st.cache_resource
+def reference_table():
+    """Quick Reference lookup table, built once as an Arrow table"""
+    use_cases, functions = zip(*REFERENCE_ROWS)
+    return pa.table({"Use Case": use_cases, "Function": functions})
+
+
+# ==================== Function Sections ====================
+
+def render_query(title: str, key: str):
+    """Show a demo query side by side with its precomputed result"""
+    col1, col2 = st.columns(2)
     
-    st.markdown("---")
-    st.markdown("### 📚 Available Tables")
+    with col1:
+        st.subheader(title)
+        st.code(QUERIES[key], language="sql")
+    
+    with col2:
+        st.dataframe(precomputed_results()[key], use_container_width=True)
+
+
+def render_sum():
+    """SUM() running total and department total examples"""
+    st.markdown("### SUM() - Running Total & Department Sum")
     st.markdown("""
-    - **employees**: employee_id, employee_name, department, salary, hire_date
-    - **sales**: sale_id, sale_date, product, amount, region
-    - **orders**: order_id, customer_id, customer_name, order_date, order_amount
-    - **performance**: employee_id, month, revenue, target
+    **Syntax:**
+    ```sql
+    SUM(column) OVER ([PARTITION BY ...] [ORDER BY ...] [ROWS BETWEEN ...])
+    ```
     """)
 
+    render_query("Running Total by Department", "sum_running_total")
+
     st.markdown("---")
-    st.markdown("### 🧠 Quick Tips")
+
+    render_query("Total Department Salary", "sum_dept_total")
+
+
+def render_avg():
+    """AVG() comparison to department average"""
+    st.markdown("### AVG() - Average with Comparison")
     st.markdown("""
-    - Window functions are **not** the same as regular aggregate functions
-    - Always use `OVER()` clause to define window frame
-    - Use `PARTITION BY` to group rows for calculations
-    - Use `ORDER BY` within `OVER()` to define row order in window
+    **Syntax:**
+    ```sql
+    AVG(column) OVER ([PARTITION BY ...] [ORDER BY ...])
+    ```
     """)
-    
-    
-    st.markdown("---")
-    st.markdown("### 👍 Rate This App")
 
-    col1, col2, col3 = st.columns(3)
+    render_query("Compare to Department Average", "avg_dept_compare")
 
-    # Initialize session state for per-button disabled flags and counts (idempotent)
-    if "disabled_love" not in st.session_state:
-        st.session_state.disabled_love = False
-    if "disabled_like" not in st.session_state:
-        st.session_state.disabled_like = False
-    if "disabled_smile" not in st.session_state:
-        st.session_state.disabled_smile = False
-    if "loves" not in st.session_state:
-        st.session_state.loves = 0
-    if "likes" not in st.session_state:
-        st.session_state.likes = 0
-    if "smiles" not in st.session_state:
-        st.session_state.smiles = 0
 
-    with col1:
-        if st.button("❤️ Love", key="love_btn", disabled=st.session_state.disabled_love):
-            st.session_state.loves += 1
-            st.session_state.disabled_love = True
-            st.session_state.disabled_like = True
-            st.session_state.disabled_smile = True
-            st.rerun()
+def render_count():
+    """COUNT() orders per customer"""
+    st.markdown("### COUNT() - Order Count per Customer")
+    st.markdown("""
+    **Syntax:**
+    ```sql
+    COUNT(column) OVER ([PARTITION BY ...] [ORDER BY ...])
+    ```
+    """)
 
-    with col2:
-        if st.button("👍 Like", key="like_btn", disabled=st.session_state.disabled_like):
-            st.session_state.likes += 1
-            st.session_state.disabled_like = True
-            st.session_state.disabled_love = True
-            st.session_state.disabled_smile = True
-            st.rerun()
+    render_query("Orders per Customer", "count_customer_orders")
 
-    with col3:
-        if st.button("😊 Smile", key="smile_btn", disabled=st.session_state.disabled_smile):
-            st.session_state.smiles += 1
-            st.session_state.disabled_smile = True
-            st.session_state.disabled_like = True
-            st.session_state.disabled_love = True
-            st.rerun()
 
-    if st.session_state.disabled_love or st.session_state.disabled_like or st.session_state.disabled_smile:
-        st.success("Thanks for your rating! 😊")
+def render_min_max():
+    """MIN() / MAX() salary range analysis"""
+    st.markdown("### MIN() / MAX() - Range Analysis")
+    st.markdown("""
+    **Syntax:**
+    ```sql
+    MIN(column) OVER (...) / MAX(column) OVER (...)
+    ```
+    """)
 
-    st.markdown("---")
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.metric("❤️ Loves", st.session_state.get("loves", 0))
-    with col2:
-        st.metric("👍 Likes", st.session_state.get("likes", 0))
-    with col3:
-        st.metric("😊 Smiles", st.session_state.get("smiles", 0))
+    render_query("Salary Range by Department", "minmax_salary_range")
 
-# ==================== HOME PAGE ====================
 
-if page == "Home":
-    st.header("Welcome to Window Functions Cheat Sheet! 👋")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown("""
-        ### What are Window Functions?
-        Window functions perform calculations across a set of rows, 
-        maintaining all original rows without condensing results.
-        
-        ### Key Benefits:
-        - ✅ Keep row-level detail with aggregate calculations
-        - ✅ Compare individual values to group statistics
-        - ✅ Rank and score data efficiently
-        - ✅ Solve complex analytics in single query
-        """)
-    
-    with col2:
-        st.info("""
-        ### Quick Start:
-        1. Choose a function category from the sidebar
-        2. View real examples with descriptions
-        3. See query and output
-        4. Try custom queries in "Custom Query" section
-        5. Reference syntax in "Quick Reference"
-        """)
-    
-    st.markdown("---")
-    
+def render_combined():
+    """All aggregates side by side"""
+    st.markdown("### Combined Aggregates - Comprehensive Analysis")
+
+    render_query("Department Summary", "combined_dept_summary")
+
+
+AGGREGATE_SECTIONS = {
+    "SUM()": render_sum,
+    "AVG()": render_avg,
+    "COUNT()": render_count,
+    "MIN()/MAX()": render_min_max,
+    "Combined": render_combined,
+}
+
+
+def render_row_number():
+    """ROW_NUMBER() top performers per department"""
+    st.markdown("### ROW_NUMBER() - Unique Sequential Numbering")
     st.markdown("""
-    <div style='text-align: center; margin: 30px 0;'>
-        <h1 style='color: #1f77b4; font-size: 2.5rem; font-weight: bold;'>
-            🎯 Core Window Function Categories
-        </h1>
-        <p style='color: #666; font-size: 1.1rem;'>Master all 15+ window functions</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    categories = {
-        "📊 Aggregate": {
-            "icon": "📈",
-            "color": "#e80c0c",
-            "funcs": ["SUM", "AVG", "COUNT", "MIN", "MAX"],
-            "desc": "Calculate aggregates within windows"
-        },
-        "🏆 Ranking": {
-            "icon": "🥇",
-            "color": "#312279",
-            "funcs": ["ROW_NUMBER", "RANK", "DENSE_RANK", "NTILE", "PERCENT_RANK"],
-            "desc": "Rank and position rows"
-        },
-        "📍 Analytical": {
-            "icon": "📊",
-            "color": "#3fb433",
-            "funcs": ["LAG", "LEAD", "FIRST_VALUE", "LAST_VALUE", "NTH_VALUE"],
-            "desc": "Access relative row values"
-        }
-    }
-    
-    col1, col2, col3 = st.columns(3, gap="large")
-    
-    for col, (cat, info) in zip([col1, col2, col3], categories.items()):
-        with col:
-            st.markdown(f"""
-            <div style='
-                background: linear-gradient(135deg, {info["color"]}20 0%, {info["color"]}05 100%);
-                border-left: 5px solid {info["color"]};
-                border-radius: 10px;
-                padding: 5px;
-                margin: 5px 0;
-                box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-            '>
-                <h2 style='color: {info["color"]}; font-size: 1.8rem; margin-bottom: 10px; font-weight: bold;'>
-                    {cat}
-                </h2>
-                <p style='color: #666; font-size: 0.95rem; margin-bottom: 20px; font-style: italic;'>
-                    {info["desc"]}
-                </p>
-                <div style='background: white; padding: 15px; border-radius: 8px;'>
-            """, unsafe_allow_html=True)
-            
-            for func in info["funcs"]:
-                st.markdown(f"""
-                <div style='
-                    background: {info["color"]}15;
-                    padding: 10px 12px;
-                    margin: 8px 0;
-                    border-radius: 6px;
-                    border-left: 3px solid {info["color"]};
-                    font-weight: bold;
-                    font-size: 1.05rem;
-                '>
-                    ▶️ <code style='color: {info["color"]}; font-size: 1.1rem;'>{func}()</code>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            st.markdown("""
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+    **Key Point:** Always returns unique numbers, even for ties
 
+    **Syntax:**
+    ```sql
+    ROW_NUMBER() OVER ([PARTITION BY ...] ORDER BY ...)
+    ```
+    """)
 
-# ==================== AGGREGATE FUNCTIONS ====================
+    render_query("Top Performers per Department", "row_number_top_performers")
 
-elif page == "Aggregate Functions":
-    st.header("Aggregate Window Functions")
-    st.markdown("Functions that perform calculations: SUM, AVG, COUNT, MIN, MAX")
-    
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(["SUM()", "AVG()", "COUNT()", "MIN()/MAX()", "Combined"])
-    
-    # SUM TAB
-    with tab1:
-        st.markdown("### SUM() - Running Total & Department Sum")
-        st.markdown("""
-        **Syntax:**
-        ```sql
-        SUM(column) OVER ([PARTITION BY ...] [ORDER BY ...] [ROWS BETWEEN ...])
-        ```
-        """)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("Running Total by Department")
-            query = """
-            SELECT 
-                employee_id,
-                employee_name,
-                department,
-                salary,
-                SUM(salary) OVER (
-                    PARTITION BY department 
-                    ORDER BY employee_id
-                    ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
-                ) AS running_total
-            FROM employees
-            ORDER BY department, employee_id;
-            """
-            st.code(query, language="sql")
-        
-        with col2:
-            result, error = execute_query(query, conn)
-            if error:
-                st.error(f"Error: {error}")
-            else:
-                st.dataframe(result, use_container_width=True)
-        
-        st.markdown("---")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("Total Department Salary")
-            query = """
-            SELECT 
-                employee_id,
-                employee_name,
-                department,
-                salary,
-                SUM(salary) OVER (PARTITION BY department) AS dept_total
-            FROM employees
-            ORDER BY department, salary DESC;
-            """
-            st.code(query, language="sql")
-        
-        with col2:
-            result, error = execute_query(query, conn)
-            if error:
-                st.error(f"Error: {error}")
-            else:
-                st.dataframe(result, use_container_width=True)
-    
-    # AVG TAB
-    with tab2:
-        st.markdown("### AVG() - Average with Comparison")
-        st.markdown("""
-        **Syntax:**
-        ```sql
-        AVG(column) OVER ([PARTITION BY ...] [ORDER BY ...])
-        ```
-        """)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("Compare to Department Average")
-            query = """
-            SELECT 
-                employee_name,
-                department,
-                salary,
-                ROUND(AVG(salary) OVER (PARTITION BY department), 2) AS dept_avg,
-                ROUND(salary - AVG(salary) OVER (PARTITION BY department), 2) AS diff_from_avg
-            FROM employees
-            ORDER BY department, salary DESC;
-            """
-            st.code(query, language="sql")
-        
-        with col2:
-            result, error = execute_query(query, conn)
-            if error:
-                st.error(f"Error: {error}")
-            else:
-                st.dataframe(result, use_container_width=True)
-    
-    # COUNT TAB
-    with tab3:
-        st.markdown("### COUNT() - Order Count per Customer")
-        st.markdown("""
-        **Syntax:**
-        ```sql
-        COUNT(column) OVER ([PARTITION BY ...] [ORDER BY ...])
-        ```
-        """)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("Orders per Customer")
-            query = """
-            SELECT 
-                order_id,
-                customer_id,
-                customer_name,
-                order_amount,
-                COUNT(*) OVER (PARTITION BY customer_id) AS customer_order_count,
-                ROUND(AVG(order_amount) OVER (PARTITION BY customer_id), 2) AS avg_order_amount
-            FROM orders
-            ORDER BY customer_id, order_date;
-            """
-            st.code(query, language="sql")
-        
-        with col2:
-            result, error = execute_query(query, conn)
-            if error:
-                st.error(f"Error: {error}")
-            else:
-                st.dataframe(result, use_container_width=True)
-    
-    # MIN/MAX TAB
-    with tab4:
-        st.markdown("### MIN() / MAX() - Range Analysis")
-        st.markdown("""
-        **Syntax:**
-        ```sql
-        MIN(column) OVER (...) / MAX(column) OVER (...)
-        ```
-        """)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("Salary Range by Department")
-            query = """
-            SELECT 
-                employee_name,
-                department,
-                salary,
-                MAX(salary) OVER (PARTITION BY department) AS max_salary,
-                MIN(salary) OVER (PARTITION BY department) AS min_salary,
-                MAX(salary) OVER (PARTITION BY department) - salary AS gap_to_max
-            FROM employees
-            ORDER BY department, salary DESC;
-            """
-            st.code(query, language="sql")
-        
-        with col2:
-            result, error = execute_query(query, conn)
-            if error:
-                st.error(f"Error: {error}")
-            else:
-                st.dataframe(result, use_container_width=True)
-    
-    # COMBINED TAB
-    with tab5:
-        st.markdown("### Combined Aggregates - Comprehensive Analysis")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("Department Summary")
-            query = """
-            SELECT 
-                department,
-                employee_name,
-                salary,
-                COUNT(*) OVER (PARTITION BY department) AS emp_count,
-                SUM(salary) OVER (PARTITION BY department) AS total_salary,
-                ROUND(AVG(salary) OVER (PARTITION BY department), 2) AS avg_salary,
-                MAX(salary) OVER (PARTITION BY department) AS max_salary,
-                MIN(salary) OVER (PARTITION BY department) AS min_salary
-            FROM employees
-            ORDER BY department, salary DESC;
-            """
-            st.code(query, language="sql")
-        
-        with col2:
-            result, error = execute_query(query, conn)
-            if error:
-                st.error(f"Error: {error}")
-            else:
-                st.dataframe(result, use_container_width=True)
 
+def render_rank():
+    """RANK() sales ranking by region"""
+    st.markdown("### RANK() - Ranking with Gaps on Ties")
+    st.markdown("""
+    **Key Point:** Has gaps when there are tied values
 
-# ==================== RANKING FUNCTIONS ====================
+    **Syntax:**
+    ```sql
+    RANK() OVER ([PARTITION BY ...] ORDER BY ...)
+    ```
+    """)
 
-elif page == "Ranking Functions":
-    st.header("Ranking Window Functions")
-    st.markdown("Functions for ranking: ROW_NUMBER, RANK, DENSE_RANK, NTILE, PERCENT_RANK")
-    
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(["ROW_NUMBER()", "RANK()", "DENSE_RANK()", "NTILE()", "PERCENT_RANK()"])
-    
-    # ROW_NUMBER TAB
-    with tab1:
-        st.markdown("### ROW_NUMBER() - Unique Sequential Numbering")
-        st.markdown("""
-        **Key Point:** Always returns unique numbers, even for ties
-        
-        **Syntax:**
-        ```sql
-        ROW_NUMBER() OVER ([PARTITION BY ...] ORDER BY ...)
-        ```
-        """)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("Top Performers per Department")
-            query = """
-            SELECT 
-                ROW_NUMBER() OVER (PARTITION BY department ORDER BY salary DESC) AS rank,
-                employee_name,
-                department,
-                salary
-            FROM employees
-            ORDER BY department, rank;
-            """
-            st.code(query, language="sql")
-        
-        with col2:
-            result, error = execute_query(query, conn)
-            if error:
-                st.error(f"Error: {error}")
-            else:
-                st.dataframe(result, use_container_width=True)
+    render_query("Sales Amount Ranking by Region", "rank_region_sales")
+
+
+def render_dense_rank():
+    """DENSE_RANK() ranking by product"""
+    st.markdown("### DENSE_RANK() - Consecutive Ranking")
+    st.markdown("""
+    **Key Point:** No gaps in ranking, consecutive numbers even with ties
+
+    **Syntax:**
+    ```sql
+    DENSE_RANK() OVER ([PARTITION BY ...] ORDER BY ...)
+    ```
+    """)
+
+    render_query("Dense Ranking by Product", "dense_rank_product")
+
+
+def render_ntile():
+    """NTILE() quartile analysis"""
+    st.markdown("### NTILE() - Divide into N Groups")
+    st.markdown("""
+    **Key Point:** Divides rows into N equal (or near-equal) groups
+
+    **Syntax:**
+    ```sql
+    NTILE(n) OVER ([PARTITION BY ...] ORDER BY ...)
+    ```
+    """)
+
+    render_query("Quartile Analysis - Sales by Quartile", "ntile_order_quartiles")
+
+
+def render_percent_rank():
+    """PERCENT_RANK() salary percentiles"""
+    st.markdown("### PERCENT_RANK() - Percentile Ranking (0-1)")
+    st.markdown("""
+    **Key Point:** Returns value between 0 and 1 representing percentile
+
+    **Syntax:**
+    ```sql
+    PERCENT_RANK() OVER ([PARTITION BY ...] ORDER BY ...)
+    ```
+    """)
+
+    render_query("Salary Percentile by Department", "percent_rank_salary")
+
+
+RANKING_SECTIONS = {
+    "ROW_NUMBER()": render_row_number,
+    "RANK()": render_rank,
+    "DENSE_RANK()": render_dense_rank,
+    "NTILE()": render_ntile,
+    "PERCENT_RANK()": render_percent_rank,
+}
+
+
+def render_lag():
+    """LAG() order-over-order comparison"""
+    st.markdown("### LAG() - Access Previous Row")
+    st.markdown("""
+    **Syntax:**
+    ```sql
+    LAG(column, offset, default_value) OVER ([PARTITION BY ...] ORDER BY ...)
+    ```
+    """)
+
+    render_query("Order-over-Order Comparison", "lag_order_change")
+
+
+def render_lead():
+    """LEAD() next sale lookup"""
+    st.markdown("### LEAD() - Access Next Row")
+    st.markdown("""
+    **Syntax:**
+    ```sql
+    LEAD(column, offset, default_value) OVER ([PARTITION BY ...] ORDER BY ...)
+    ```
+    """)
+
+    render_query("Next Sale Prediction", "lead_next_sale")
+
+
+def render_first_value():
+    """FIRST_VALUE() comparison to first order"""
+    st.markdown("### FIRST_VALUE() - First Row Value")
+    st.markdown("""
+    **Syntax:**
+    ```sql
+    FIRST_VALUE(column) OVER ([PARTITION BY ...] ORDER BY ... [ROWS ...])
+    ```
+    """)
+
+    render_query("Compare to First Order", "first_value_order")
+
+
+def render_last_value():
+    """LAST_VALUE() latest order with full frame"""
+    st.markdown("### LAST_VALUE() - Last Row Value (Full Frame Required)")
+    st.markdown("""
+    **Syntax:**
+    ```sql
+    LAST_VALUE(column) OVER ([PARTITION BY ...] ORDER BY ... 
+    ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING)
+    ```
+    """)
+
+    render_query("Latest Order Amount", "last_value_order")
+
+
+def render_nth_value():
+    """NTH_VALUE() second highest salary"""
+    st.markdown("### NTH_VALUE() - Nth Row Value")
+    st.markdown("""
+    **Syntax:**
+    ```sql
+    NTH_VALUE(column, n) OVER ([PARTITION BY ...] ORDER BY ... [ROWS ...])
+    ```
+    """)
+
+    render_query("Get 2nd Highest Salary per Department", "nth_value_second_salary")
+
+
+ANALYTICAL_SECTIONS = {
+    "LAG()": render_lag,
+    "LEAD()": render_lead,
+    "FIRST_VALUE()": render_first_value,
+    "LAST_VALUE()": render_last_value,
+    "NTH_VALUE()": render_nth_value,
+}
+
+
+@st.fragment
+def render_function_page(title: str, summary: str, sections: dict, key: str):
+    """Function category page; picking a section reruns only this fragment"""
+    st.header(title)
+    st.markdown(summary)
     
-    # RANK TAB
-    with tab2:
-        st.markdown("### RANK() - Ranking with Gaps on Ties")
-        st.markdown("""
-        **Key Point:** Has gaps when there are tied values
-        
-        **Syntax:**
-        ```sql
-        RANK() OVER ([PARTITION BY ...] ORDER BY ...)
-        ```
-        """)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("Sales Amount Ranking by Region")
-            query = """
-            SELECT 
-                RANK() OVER (PARTITION BY region ORDER BY amount DESC) AS rank,
-                product,
-                region,
-                amount
-            FROM sales
-            ORDER BY region, rank;
-            """
-            st.code(query, language="sql")
-        
-        with col2:
-            result, error = execute_query(query, conn)
-            if error:
-                st.error(f"Error: {error}")
-            else:
-                st.dataframe(result, use_container_width=True)
+    choice = st.radio(
+        "Select a function:",
+        list(sections),
+        horizontal=True,
+        key=key,
+        label_visibility="collapsed"
+    )
+    sections[choice]()
+
+
+# ==================== Rating Panel ====================
+
+RATING_DEFAULTS = {
+    "disabled_love": False,
+    "disabled_like": False,
+    "disabled_smile": False,
+    "loves": 0,
+    "likes": 0,
+    "smiles": 0,
+}
+
+
+def rate(counter: str):
+    """Count a rating and disable all rating buttons"""
+    st.session_state[counter] += 1
+    st.session_state.disabled_love = True
+    st.session_state.disabled_like = True
+    st.session_state.disabled_smile = True
+
+
+@st.fragment
+def rating_panel():
+    """Rating buttons and counters, rerun on their own when clicked"""
+    col1, col2, col3 = st.columns(3)
+
+    # Initialize session state for per-button disabled flags and counts (idempotent)
+    for key, default in RATING_DEFAULTS.items():
+        st.session_state.setdefault(key, default)
+
+    with col1:
+        st.button(
+            "❤️ Love",
+            key="love_btn",
+            on_click=rate,
+            args=("loves",),
+            disabled=st.session_state.disabled_love
+        )
+
+    with col2:
+        st.button(
+            "👍 Like",
+            key="like_btn",
+            on_click=rate,
+            args=("likes",),
+            disabled=st.session_state.disabled_like
+        )
+
+    with col3:
+        st.button(
+            "😊 Smile",
+            key="smile_btn",
+            on_click=rate,
+            args=("smiles",),
+            disabled=st.session_state.disabled_smile
+        )
+
+    if st.session_state.disabled_love or st.session_state.disabled_like or st.session_state.disabled_smile:
+        st.success("Thanks for your rating! 😊")
+
+    st.markdown("---")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("❤️ Loves", st.session_state.get("loves", 0))
+    with col2:
+        st.metric("👍 Likes", st.session_state.get("likes", 0))
+    with col3:
+        st.metric("😊 Smiles", st.session_state.get("smiles", 0))
+
+
+# ==================== Main App ====================
+
+st.title("📊 SQL Window Functions Interactive Cheat Sheet")
+st.markdown("Master SQL Window Functions with Real-Time Examples...")
+
+# Build the database and every demo result up front; later reruns are lookups
+precomputed_results()
+
+# Sidebar Navigation
+with st.sidebar:
+    st.header("📊 SQL Window Functions")
+    page = st.radio(
+        "Select a Section:",
+        [
+            "Home",
+            "Aggregate Functions",
+            "Ranking Functions",
+            "Analytical Functions",
+            "Sample Data",
+            "Custom Query",
+            "Quick Reference"
+        ],
+        key="page",
+        label_visibility="collapsed"
+    )
     
-    # DENSE_RANK TAB
-    with tab3:
-        st.markdown("### DENSE_RANK() - Consecutive Ranking")
-        st.markdown("""
-        **Key Point:** No gaps in ranking, consecutive numbers even with ties
-        
-        **Syntax:**
-        ```sql
-        DENSE_RANK() OVER ([PARTITION BY ...] ORDER BY ...)
-        ```
-        """)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("Dense Ranking by Product")
-            query = """
-            SELECT 
-                DENSE_RANK() OVER (PARTITION BY product ORDER BY amount DESC) AS rank,
-                product,
-                region,
-                amount
-            FROM sales
-            ORDER BY product, rank;
-            """
-            st.code(query, language="sql")
-        
-        with col2:
-            result, error = execute_query(query, conn)
-            if error:
-                st.error(f"Error: {error}")
-            else:
-                st.dataframe(result, use_container_width=True)
+    st.markdown("---")
+    st.markdown("### 📚 Available Tables")
+    st.markdown("""
+    - **employees**: employee_id, employee_name, department, salary, hire_date
+    - **sales**: sale_id, sale_date, product, amount, region
+    - **orders**: order_id, customer_id, customer_name, order_date, order_amount
+    - **performance**: employee_id, month, revenue, target
+    """)
+
+    st.markdown("---")
+    st.markdown("### 🧠 Quick Tips")
+    st.markdown("""
+    - Window functions are **not** the same as regular aggregate functions
+    - Always use `OVER()` clause to define window frame
+    - Use `PARTITION BY` to group rows for calculations
+    - Use `ORDER BY` within `OVER()` to define row order in window
+    """)
     
-    # NTILE TAB
-    with tab4:
-        st.markdown("### NTILE() - Divide into N Groups")
-        st.markdown("""
-        **Key Point:** Divides rows into N equal (or near-equal) groups
-        
-        **Syntax:**
-        ```sql
-        NTILE(n) OVER ([PARTITION BY ...] ORDER BY ...)
-        ```
-        """)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("Quartile Analysis - Sales by Quartile")
-            query = """
-            SELECT 
-                NTILE(4) OVER (ORDER BY order_amount DESC) AS quartile,
-                customer_name,
-                order_amount
-            FROM orders
-            ORDER BY quartile, order_amount DESC;
-            """
-            st.code(query, language="sql")
-        
-        with col2:
-            result, error = execute_query(query, conn)
-            if error:
-                st.error(f"Error: {error}")
-            else:
-                st.dataframe(result, use_container_width=True)
     
-    # PERCENT_RANK TAB
-    with tab5:
-        st.markdown("### PERCENT_RANK() - Percentile Ranking (0-1)")
-        st.markdown("""
-        **Key Point:** Returns value between 0 and 1 representing percentile
-        
-        **Syntax:**
-        ```sql
-        PERCENT_RANK() OVER ([PARTITION BY ...] ORDER BY ...)
-        ```
-        """)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("Salary Percentile by Department")
-            query = """
-            SELECT 
-                employee_name,
-                department,
-                salary,
-                ROUND(PERCENT_RANK() OVER (PARTITION BY department ORDER BY salary), 4) AS pct_rank,
-                ROUND(PERCENT_RANK() OVER (PARTITION BY department ORDER BY salary) * 100, 2) AS pct
-            FROM employees
-            ORDER BY department, salary;
-            """
-            st.code(query, language="sql")
-        
-        with col2:
-            result, error = execute_query(query, conn)
-            if error:
-                st.error(f"Error: {error}")
-            else:
-                st.dataframe(result, use_container_width=True)
+    st.markdown("---")
+    st.markdown("### 👍 Rate This App")
 
+    rating_panel()
 
-# ==================== ANALYTICAL FUNCTIONS ====================
+# ==================== HOME PAGE ====================
 
-elif page == "Analytical Functions":
-    st.header("Analytical Window Functions")
-    st.markdown("Functions for accessing relative rows: LAG, LEAD, FIRST_VALUE, LAST_VALUE, NTH_VALUE")
+if page == "Home":
+    st.header("Welcome to Window Functions Cheat Sheet! 👋")
     
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(["LAG()", "LEAD()", "FIRST_VALUE()", "LAST_VALUE()", "NTH_VALUE()"])
+    col1, col2 = st.columns(2)
     
-    # LAG TAB
-    with tab1:
-        st.markdown("### LAG() - Access Previous Row")
+    with col1:
         st.markdown("""
-        **Syntax:**
-        ```sql
-        LAG(column, offset, default_value) OVER ([PARTITION BY ...] ORDER BY ...)
-        ```
-        """)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("Order-over-Order Comparison")
-            query = """
-            SELECT 
-                order_id,
-                customer_name,
-                order_amount,
-                LAG(order_amount) OVER (PARTITION BY customer_id ORDER BY order_id) AS prev_order,
-                order_amount - LAG(order_amount) OVER (PARTITION BY customer_id ORDER BY order_id) AS change
-            FROM orders
-            ORDER BY customer_id, order_id;
-            """
-            st.code(query, language="sql")
+        ### What are Window Functions?
+        Window functions perform calculations across a set of rows, 
+        maintaining all original rows without condensing results.
         
-        with col2:
-            result, error = execute_query(query, conn)
-            if error:
-                st.error(f"Error: {error}")
-            else:
-                st.dataframe(result, use_container_width=True)
-    
-    # LEAD TAB
-    with tab2:
-        st.markdown("### LEAD() - Access Next Row")
-        st.markdown("""
-        **Syntax:**
-        ```sql
-        LEAD(column, offset, default_value) OVER ([PARTITION BY ...] ORDER BY ...)
-        ```
+        ### Key Benefits:
+        - ✅ Keep row-level detail with aggregate calculations
+        - ✅ Compare individual values to group statistics
+        - ✅ Rank and score data efficiently
+        - ✅ Solve complex analytics in single query
         """)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("Next Sale Prediction")
-            query = """
-            SELECT 
-                sale_id,
-                product,
-                amount,
-                LEAD(amount) OVER (PARTITION BY product ORDER BY sale_id) AS next_amount,
-                LEAD(sale_date) OVER (PARTITION BY product ORDER BY sale_id) AS next_date
-            FROM sales
-            ORDER BY product, sale_id;
-            """
-            st.code(query, language="sql")
-        
-        with col2:
-            result, error = execute_query(query, conn)
-            if error:
-                st.error(f"Error: {error}")
-            else:
-                st.dataframe(result, use_container_width=True)
     
-    # FIRST_VALUE TAB
-    with tab3:
-        st.markdown("### FIRST_VALUE() - First Row Value")
-        st.markdown("""
-        **Syntax:**
-        ```sql
-        FIRST_VALUE(column) OVER ([PARTITION BY ...] ORDER BY ... [ROWS ...])
-        ```
+    with col2:
+        st.info("""
+        ### Quick Start:
+        1. Choose a function category from the sidebar
+        2. View real examples with descriptions
+        3. See query and output
+        4. Try custom queries in "Custom Query" section
+        5. Reference syntax in "Quick Reference"
         """)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("Compare to First Order")
-            query = """
-            SELECT 
-                order_id,
-                customer_name,
-                order_amount,
-                FIRST_VALUE(order_amount) OVER (
-                    PARTITION BY customer_id 
-                    ORDER BY order_id
-                ) AS first_order,
-                order_amount - FIRST_VALUE(order_amount) OVER (
-                    PARTITION BY customer_id 
-                    ORDER BY order_id
-                ) AS growth
-            FROM orders
-            ORDER BY customer_id, order_id;
-            """
-            st.code(query, language="sql")
-        
-        with col2:
-            result, error = execute_query(query, conn)
-            if error:
-                st.error(f"Error: {error}")
-            else:
-                st.dataframe(result, use_container_width=True)
     
-    # LAST_VALUE TAB
-    with tab4:
-        st.markdown("### LAST_VALUE() - Last Row Value (Full Frame Required)")
-        st.markdown("""
-        **Syntax:**
-        ```sql
-        LAST_VALUE(column) OVER ([PARTITION BY ...] ORDER BY ... 
-        ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING)
-        ```
-        """)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("Latest Order Amount")
-            query = """
-            SELECT 
-                order_id,
-                customer_name,
-                order_amount,
-                LAST_VALUE(order_amount) OVER (
-                    PARTITION BY customer_id 
-                    ORDER BY order_id
-                    ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
-                ) AS latest_order,
-                LAST_VALUE(order_id) OVER (
-                    PARTITION BY customer_id 
-                    ORDER BY order_id
-                    ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
-                ) AS latest_order_id
-            FROM orders
-            ORDER BY customer_id, order_id;
-            """
-            st.code(query, language="sql")
-        
-        with col2:
-            result, error = execute_query(query, conn)
-            if error:
-                st.error(f"Error: {error}")
-            else:
-                st.dataframe(result, use_container_width=True)
+    st.markdown("---")
     
-    # NTH_VALUE TAB
-    with tab5:
-        st.markdown("### NTH_VALUE() - Nth Row Value")
-        st.markdown("""
-        **Syntax:**
-        ```sql
-        NTH_VALUE(column, n) OVER ([PARTITION BY ...] ORDER BY ... [ROWS ...])
-        ```
-        """)
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.subheader("Get 2nd Highest Salary per Department")
-            query = """
-            WITH ranked_employees AS (
-                SELECT
-                    department,
-                    employee_name,
-                    salary,
-                    NTH_VALUE(salary, 2) OVER (
-                        PARTITION BY department 
-                        ORDER BY salary DESC
-                        ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
-                    ) AS second_highest_salary,
-                    NTH_VALUE(employee_name, 2) OVER (
-                        PARTITION BY department 
-                        ORDER BY salary DESC
-                        ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
-                    ) AS second_highest_emp
-                FROM employees
-            )
-            SELECT DISTINCT
-                department,
-                second_highest_salary,
-                second_highest_emp
-            FROM ranked_employees
-            WHERE second_highest_salary IS NOT NULL;
-            """
-            st.code(query, language="sql")
-        
-        with col2:
-            result, error = execute_query(query, conn)
-            if error:
-                st.error(f"Error: {error}")
-            else:
-                st.dataframe(result, use_container_width=True)
+    st.html(HOME_BANNER_HTML)
+    
+    categories = {
+        "📊 Aggregate": {
+            "icon": "📈",
+            "color": "#e80c0c",
+            "funcs": ["SUM", "AVG", "COUNT", "MIN", "MAX"],
+            "desc": "Calculate aggregates within windows"
+        },
+        "🏆 Ranking": {
+            "icon": "🥇",
+            "color": "#312279",
+            "funcs": ["ROW_NUMBER", "RANK", "DENSE_RANK", "NTILE", "PERCENT_RANK"],
+            "desc": "Rank and position rows"
+        },
+        "📍 Analytical": {
+            "icon": "📊",
+            "color": "#3fb433",
+            "funcs": ["LAG", "LEAD", "FIRST_VALUE", "LAST_VALUE", "NTH_VALUE"],
+            "desc": "Access relative row values"
+        }
+    }
+    
+    col1, col2, col3 = st.columns(3, gap="large")
+    
+    for col, (cat, info) in zip([col1, col2, col3], categories.items()):
+        with col:
+            funcs_html = "".join(f"""
+                    <div style='
+                        background: {info["color"]}15;
+                        padding: 10px 12px;
+                        margin: 8px 0;
+                        border-radius: 6px;
+                        border-left: 3px solid {info["color"]};
+                        font-weight: bold;
+                        font-size: 1.05rem;
+                    '>
+                        ▶️ <code style='color: {info["color"]}; font-size: 1.1rem;'>{func}()</code>
+                    </div>""" for func in info["funcs"])
+            
+            # Each card must be a single element: Streamlit closes any tags
+            # left open at the end of an element
+            st.html(f"""
+            <div style='
+                background: linear-gradient(135deg, {info["color"]}20 0%, {info["color"]}05 100%);
+                border-left: 5px solid {info["color"]};
+                border-radius: 10px;
+                padding: 5px;
+                margin: 5px 0;
+                box-shadow: 0 4px 15px rgba(0,0,0,0.1);
+            '>
+                <h2 style='color: {info["color"]}; font-size: 1.8rem; margin-bottom: 10px; font-weight: bold;'>
+                    {cat}
+                </h2>
+                <p style='color: #666; font-size: 0.95rem; margin-bottom: 20px; font-style: italic;'>
+                    {info["desc"]}
+                </p>
+                <div style='background: white; padding: 15px; border-radius: 8px;'>{funcs_html}
+                </div>
+            </div>
+            """)
+
+
+# ==================== AGGREGATE FUNCTIONS ====================
+
+elif page == "Aggregate Functions":
+    render_function_page(
+        "Aggregate Window Functions",
+        "Functions that perform calculations: SUM, AVG, COUNT, MIN, MAX",
+        AGGREGATE_SECTIONS,
+        key="aggregate_function"
+    )
+
+
+# ==================== RANKING FUNCTIONS ====================
+
+elif page == "Ranking Functions":
+    render_function_page(
+        "Ranking Window Functions",
+        "Functions for ranking: ROW_NUMBER, RANK, DENSE_RANK, NTILE, PERCENT_RANK",
+        RANKING_SECTIONS,
+        key="ranking_function"
+    )
+
+
+# ==================== ANALYTICAL FUNCTIONS ====================
+
+elif page == "Analytical Functions":
+    render_function_page(
+        "Analytical Window Functions",
+        "Functions for accessing relative rows: LAG, LEAD, FIRST_VALUE, LAST_VALUE, NTH_VALUE",
+        ANALYTICAL_SECTIONS,
+        key="analytical_function"
+    )
 
 
 # ==================== SAMPLE DATA ====================
@@ -910,27 +1223,27 @@ elif page == "Sample Data":
     
     tab1, tab2, tab3, tab4 = st.tabs(["Employees", "Sales", "Orders", "Performance"])
     
-    employees_df, sales_df, orders_df, performance_df = create_sample_data()
+    employees, sales, orders, performance = sample_tables()
     
     with tab1:
         st.subheader("Employees Table")
         st.info("10 employees across 4 departments with various salary levels")
-        st.dataframe(employees_df, use_container_width=True)
+        st.dataframe(employees, use_container_width=True)
     
     with tab2:
         st.subheader("Sales Table")
         st.info("20 sales transactions across 3 products and 4 regions")
-        st.dataframe(sales_df, use_container_width=True)
+        st.dataframe(sales, use_container_width=True)
     
     with tab3:
         st.subheader("Orders Table")
         st.info("20 orders from 9 customers at different dates")
-        st.dataframe(orders_df, use_container_width=True)
+        st.dataframe(orders, use_container_width=True)
     
     with tab4:
         st.subheader("Performance Table")
         st.info("Monthly performance metrics comparing revenue vs target")
-        st.dataframe(performance_df, use_container_width=True)
+        st.dataframe(performance, use_container_width=True)
 
 
 # ==================== CUSTOM QUERY ====================
@@ -943,72 +1256,11 @@ elif page == "Custom Query":
     
     with col1:
         st.markdown("### Available Tables & Columns:")
-        st.markdown("""
-        **employees**
-        - employee_id (INTEGER)
-        - employee_name (TEXT)
-        - department (TEXT)
-        - salary (INTEGER)
-        - hire_date (TEXT)
-        
-        **sales**
-        - sale_id (INTEGER)
-        - sale_date (DATETIME)
-        - product (TEXT)
-        - amount (INTEGER)
-        - region (TEXT)
-        
-        **orders**
-        - order_id (INTEGER)
-        - customer_id (INTEGER)
-        - customer_name (TEXT)
-        - order_date (DATETIME)
-        - order_amount (INTEGER)
-        
-        **performance**
-        - employee_id (INTEGER)
-        - month (TEXT)
-        - revenue (INTEGER)
-        - target (INTEGER)
-        """)
+        st.markdown(AVAILABLE_TABLES_MD)
     
     with col2:
         st.markdown("### Query Examples:")
-        st.markdown("""
-        ```sql
-        -- Running Total of Sales Amount
-        SELECT 
-            sale_id,
-            product,
-            amount,
-            SUM(amount) OVER (ORDER BY sale_id)
-        FROM sales;
-        ```
-        
-        ```sql
-        -- Top 3 Sales by Region
-        SELECT * FROM (
-            SELECT 
-            *,
-            ROW_NUMBER() OVER (PARTITION BY region 
-                        ORDER BY amount DESC)
-            FROM sales
-        ) WHERE ROW_NUMBER <= 3;
-        ```
-        ```sql
-        -- Moving Average of Sales Amount
-        SELECT 
-            sale_id,
-            sale_date,
-            amount,
-            AVG(amount) OVER (
-            ORDER BY sale_id
-            ROWS BETWEEN 2 PRECEDING AND CURRENT ROW
-            ) as moving_avg
-        FROM sales;
-        ```
-        
-        """)
+        st.markdown(QUERY_EXAMPLES_MD)
     
     st.markdown("---")
     
@@ -1026,20 +1278,38 @@ ORDER BY department, salary DESC;"""
     )
     
     if st.button("🚀 Execute Query", key="execute_query"):
-        result, error = execute_query(query_input, conn)
+        # Re-running unchanged SQL reuses this session's last result
+        if st.session_state.get("_last_sql") != query_input:
+            st.session_state["_last_result"] = execute_query(query_input)
+            # Only successes are reused, so a failed or timed-out query can be retried
+            succeeded = st.session_state["_last_result"][1] is None
+            st.session_state["_last_sql"] = query_input if succeeded else None
+        result, error = st.session_state["_last_result"]
         
         if error:
             st.error(f"❌ Query Error: {error}")
         else:
             st.success("✅ Query executed successfully!")
-            st.dataframe(result, use_container_width=True)
+            if len(result) > PREVIEW_ROWS:
+                # Only the preview is sent to the browser; the full result is a download
+                st.caption(f"Showing the first {PREVIEW_ROWS} of {len(result)} rows")
+                st.dataframe(result.slice(0, PREVIEW_ROWS), use_container_width=True)
+                st.download_button(
+                    "📥 Download full CSV",
+                    result.to_pandas().to_csv(index=False).encode(),
+                    file_name="query_result.csv",
+                    mime="text/csv",
+                    on_click="ignore"
+                )
+            else:
+                st.dataframe(result, use_container_width=True)
             
             # Show statistics
             if len(result) > 0:
                 col1, col2, col3 = st.columns(3)
                 col1.metric("Rows Returned", len(result))
-                col2.metric("Columns", len(result.columns))
-                col3.metric("Memory Usage", f"{result.memory_usage(deep=True).sum() / 1024:.2f} KB")
+                col2.metric("Columns", result.num_columns)
+                col3.metric("Memory Usage (approx)", f"{result.nbytes / 1024:.2f} KB")
 
 
 # ==================== QUICK REFERENCE ====================
@@ -1051,227 +1321,67 @@ elif page == "Quick Reference":
     
     with tab1:
         st.markdown("### Basic Window Function Syntax")
-        st.code("""
-SELECT
-    column1,
-    column2,
-    WINDOW_FUNCTION() OVER (
-        [PARTITION BY column]
-        [ORDER BY column [ASC|DESC]]
-        [ROWS BETWEEN ... AND ...]
-    ) AS window_result
-FROM table_name;
-        """, language="sql")
+        st.code(SNIPPETS["basic_syntax"], language="sql")
         
         st.markdown("### Frame Boundaries")
-        st.code("""
-ROWS BETWEEN
-    UNBOUNDED PRECEDING      -- From first row
-    | n PRECEDING            -- n rows before
-    | CURRENT ROW
-    AND
-    CURRENT ROW
-    | n FOLLOWING            -- n rows after
-    | UNBOUNDED FOLLOWING    -- To last row
-        """, language="sql")
+        st.code(SNIPPETS["frame_bounds"], language="sql")
         
         st.markdown("### RANGE vs ROWS")
         col1, col2 = st.columns(2)
         with col1:
             st.markdown("**ROWS (Physical)**")
-            st.code("""ROWS BETWEEN 5 PRECEDING 
-AND CURRENT ROW""", language="sql")
+            st.code(SNIPPETS["rows_frame"], language="sql")
         with col2:
             st.markdown("**RANGE (Value-based)**")
-            st.code("""RANGE BETWEEN INTERVAL '7 days' PRECEDING 
-AND CURRENT ROW""", language="sql")
+            st.code(SNIPPETS["range_frame"], language="sql")
     
     with tab2:
         st.markdown("### Running Total Pattern")
-        st.code("""
-SELECT 
-    date,
-    amount,
-    SUM(amount) OVER (
-        ORDER BY date
-        ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
-    ) as running_total
-FROM transactions;
-        """, language="sql")
+        st.code(SNIPPETS["running_total"], language="sql")
         
         st.markdown("### Top N Per Group Pattern")
-        st.code("""
-SELECT * FROM (
-    SELECT 
-        *,
-        ROW_NUMBER() OVER (
-            PARTITION BY department 
-            ORDER BY salary DESC
-        ) as rank
-    FROM employees
-) ranked
-WHERE rank <= 3;
-        """, language="sql")
+        st.code(SNIPPETS["top_n_per_group"], language="sql")
         
         st.markdown("### Comparison to Group Average Pattern")
-        st.code("""
-SELECT 
-    name,
-    value,
-    AVG(value) OVER (PARTITION BY group) as avg,
-    value - AVG(value) OVER (PARTITION BY group) as diff
-FROM data;
-        """, language="sql")
+        st.code(SNIPPETS["group_average"], language="sql")
         
         st.markdown("### Month-over-Month Change Pattern")
-        st.code("""
-SELECT 
-    month,
-    revenue,
-    LAG(revenue) OVER (ORDER BY month) as prev_revenue,
-    revenue - LAG(revenue) OVER (ORDER BY month) as change,
-    ROUND(100.0 * (revenue - LAG(revenue) OVER (ORDER BY month)) 
-        / LAG(revenue) OVER (ORDER BY month), 2) as pct_change
-FROM monthly_data;
-        """, language="sql")
+        st.code(SNIPPETS["month_over_month"], language="sql")
     
     with tab3:
         st.markdown("### ❌ Mistake 1: Missing ORDER BY")
         col1, col2 = st.columns(2)
         with col1:
             st.error("**Wrong**")
-            st.code("""SELECT 
-    SUM(salary) OVER (
-        PARTITION BY department
-    )
-FROM employees;
--- Returns department total, not running total!
-            """, language="sql")
+            st.code(SNIPPETS["missing_order_by_wrong"], language="sql")
         with col2:
             st.success("**Correct**")
-            st.code("""SELECT 
-    SUM(salary) OVER (
-        PARTITION BY department
-        ORDER BY employee_id
-        ROWS BETWEEN UNBOUNDED PRECEDING 
-            AND CURRENT ROW
-    )
-FROM employees;
--- Returns running total
-            """, language="sql")
+            st.code(SNIPPETS["missing_order_by_correct"], language="sql")
         
         st.markdown("### ❌ Mistake 2: Wrong Frame for LAST_VALUE()")
         col1, col2 = st.columns(2)
         with col1:
             st.error("**Wrong**")
-            st.code("""SELECT 
-    LAST_VALUE(salary) OVER (
-        PARTITION BY department 
-        ORDER BY employee_id
-    )
--- Returns current or next row only!
-            """, language="sql")
+            st.code(SNIPPETS["last_value_frame_wrong"], language="sql")
         with col2:
             st.success("**Correct**")
-            st.code("""SELECT 
-    LAST_VALUE(salary) OVER (
-        PARTITION BY department 
-        ORDER BY employee_id
-        ROWS BETWEEN UNBOUNDED PRECEDING 
-            AND UNBOUNDED FOLLOWING
-    )
--- Returns actual last value
-            """, language="sql")
+            st.code(SNIPPETS["last_value_frame_correct"], language="sql")
         
         st.markdown("### ❌ Mistake 3: Using Window Function in GROUP BY")
         col1, col2 = st.columns(2)
         with col1:
             st.error("**Wrong**")
-            st.code("""SELECT 
-    department,
-    ROW_NUMBER() OVER (...) as num
-FROM employees
-GROUP BY department
--- Error! Can't use window in GROUP BY
-            """, language="sql")
+            st.code(SNIPPETS["window_in_group_by_wrong"], language="sql")
         with col2:
             st.success("**Correct**")
-            st.code("""WITH ranked AS (
-    SELECT 
-        department,
-        salary,
-        ROW_NUMBER() OVER (...) as num
-    FROM employees
-)
-SELECT * FROM ranked
--- Use CTE first
-            """, language="sql")
+            st.code(SNIPPETS["window_in_group_by_correct"], language="sql")
     
     with tab4:
         st.markdown("### ✅ Performance Tips")
-        st.markdown("""
-        1. **Index Partition Columns**: Create index on columns used in PARTITION BY
-           ```sql
-           CREATE INDEX idx_dept_id ON employees(department, employee_id);
-           ```
-        
-        2. **Check Execution Plan**: Understand query performance
-           ```sql
-           EXPLAIN SELECT ... FROM employees WHERE ...;
-           ```
-        
-        3. **Materialize Complex Results**: Store intermediate results
-           ```sql
-           CREATE TEMP TABLE ranked_data AS
-           SELECT *, ROW_NUMBER() OVER (...) FROM ...;
-           ```
-        
-        4. **Use Specific Frames**: Narrow frames perform better
-           ```sql
-           -- Better: Specific frame
-           ROWS BETWEEN 10 PRECEDING AND CURRENT ROW
-           -- Instead of: Full frame
-           ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
-           ```
-        
-        5. **Reuse Window Definitions**: Use WINDOW clause (some SQL dialects)
-           ```sql
-           SELECT *, 
-               ROW_NUMBER() OVER w as rn,
-               RANK() OVER w as rank
-           FROM employees
-           WINDOW w AS (PARTITION BY department ORDER BY salary DESC);
-           ```
-        """)
+        st.markdown(PERF_TIPS_MD)
         
         st.markdown("### When to Use Which Function")
-        reference_df = pd.DataFrame({
-            "Use Case": [
-                "Get running total",
-                "Top N per group",
-                "Compare individuals to group",
-                "Date-over-date change",
-                "Rank with gaps on ties",
-                "Rank without gaps",
-                "Divide into quartiles",
-                "Get previous row value",
-                "Access first value",
-                "Complex relative position"
-            ],
-            "Function": [
-                "SUM + ORDER BY + ROWS",
-                "ROW_NUMBER + PARTITION BY",
-                "AVG + PARTITION BY",
-                "LAG or LEAD",
-                "RANK()",
-                "DENSE_RANK()",
-                "NTILE(4)",
-                "LAG()",
-                "FIRST_VALUE()",
-                "NTH_VALUE()"
-            ]
-        })
-        st.dataframe(reference_df, use_container_width=True)
+        st.table(reference_table())
 
 
 # Footer